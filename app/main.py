@@ -1,8 +1,11 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 
 app = FastAPI(title="Adaptive Health AI")
 
+# Liveness probe body is fixed, so serialize it once and reuse the Response.
+_HEALTH_RESPONSE = Response(content=b'{"status":"ok"}', media_type="application/json")
+
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return _HEALTH_RESPONSE
@@ -5,7 +5,8 @@ Pin package versions in an environment.yml using installed versions from a conda
 What it does:
 1) Reads an input environment.yml
 2) Pins conda dependencies to the exact versions installed in a specified conda env
-3) Optionally pins pip dependencies inside any `pip:` subsection using `pip freeze`
+3) Optionally pins pip dependencies inside any `pip:` subsection using the env's
+   installed distribution metadata (falling back to `pip freeze`)
 4) Writes the pinned environment file (or updates the input in-place)
 5) Optionally runs conda-lock to generate an explicit linux-64 lock file from the pinned env
 
@@ -28,12 +29,14 @@ Examples:
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import os
 import re
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -43,6 +46,28 @@ except ImportError:
     print("Missing dependency: PyYAML. Install with: pip install pyyaml", file=sys.stderr)
     raise SystemExit(1)
 
+try:
+    # libyaml-backed C implementations, when PyYAML was built with them
+    from yaml import CSafeDumper as _YamlDumper
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    import orjson  # optional: faster JSON parsing
+except ImportError:
+    orjson = None
+
+_NORMALIZE_RE = re.compile(r"[-_.]+")
+_CONDA_NAME_RE = re.compile(r"^([A-Za-z0-9_.-]+)")
+_PIP_NAME_RE = re.compile(r"^([A-Za-z0-9_.-]+)(\[.*\])?$")
+_PIP_NAME_PREFIX_RE = re.compile(r"^([A-Za-z0-9_.-]+)(\[[^\]]*\])?")
+
+# Core metadata headers (Name/Version always lead the METADATA/PKG-INFO file)
+_METADATA_NAME_RE = re.compile(r"^Name:[ \t]*(\S+)[ \t]*$", re.MULTILINE)
+_METADATA_VERSION_RE = re.compile(r"^Version:[ \t]*(\S+)[ \t]*$", re.MULTILINE)
+
 
 # def run(cmd: list[str]) -> str:
 #     """Run a command and return stdout. Raise on non-zero exit."""
@@ -51,6 +76,7 @@ except ImportError:
 #         raise RuntimeError(f"Command failed: {' '.join(cmd)}\n{proc.stderr.strip()}")
 #     return proc.stdout
 
+@functools.lru_cache(maxsize=1)
 def _resolve_conda_exe() -> str:
     """
     Resolve a runnable conda executable on Windows/Miniforge setups.
@@ -59,6 +85,8 @@ def _resolve_conda_exe() -> str:
     1) CONDA_EXE environment variable (set by conda shells)
     2) PATH lookup for conda/conda.bat/conda.exe
     3) Common Miniforge/Conda locations relative to sys.prefix
+
+    The result is cached for the lifetime of the process.
     """
     conda_exe = os.environ.get("CONDA_EXE")
     if conda_exe and Path(conda_exe).exists():
@@ -102,9 +130,46 @@ def run(cmd: list[str]) -> str:
     return proc.stdout
 
 
+def _json_loads(data: bytes | str) -> Any:
+    """Parse JSON with orjson when available, falling back to the stdlib parser."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@functools.lru_cache(maxsize=None)
+def _env_prefix(env_name: str) -> Path | None:
+    """
+    Locate the prefix directory of a named conda environment.
+
+    Resolution order:
+    1) The active environment (CONDA_DEFAULT_ENV/CONDA_PREFIX), without a subprocess
+    2) `conda info --json` (the `envs` list, or `root_prefix` for "base")
+
+    Returns None if the environment cannot be located. The result is cached
+    per env name, so `conda info` runs at most once per process.
+    """
+    active_prefix = os.environ.get("CONDA_PREFIX")
+    if active_prefix and os.environ.get("CONDA_DEFAULT_ENV") == env_name:
+        return Path(active_prefix)
+
+    try:
+        info = _json_loads(run(["conda", "info", "--json"]))
+    except Exception:
+        return None
+
+    if env_name == "base" and info.get("root_prefix"):
+        return Path(info["root_prefix"])
+
+    for env in info.get("envs", []):
+        if Path(env).name == env_name:
+            return Path(env)
+    return None
+
+
 def load_env_yml(path: Path) -> dict[str, Any]:
     """Load and validate a conda environment YAML file."""
-    data = yaml.safe_load(path.read_text())
+    data = yaml.load(path.read_text(), Loader=_YamlLoader)
     if not isinstance(data, dict):
         raise ValueError("environment.yml is not a valid YAML mapping.")
     return data
@@ -113,15 +178,63 @@ def load_env_yml(path: Path) -> dict[str, Any]:
 def conda_list_json(env_name: str) -> list[dict[str, Any]]:
     """Return installed conda packages for an environment via `conda list --json`."""
     out = run(["conda", "list", "-n", env_name, "--json"])
-    return json.loads(out)
+    return _json_loads(out)
+
 
+def site_packages_pkgs(prefix: Path) -> dict[str, str] | None:
+    """
+    Read installed Python distributions straight from the env's site-packages.
 
-def pip_freeze(env_name: str) -> dict[str, str]:
+    Scans `*.dist-info/METADATA` and `*.egg-info` (a `PKG-INFO` directory or a
+    single metadata file) headers for Name and Version, avoiding the `conda run`
+    and pip startup costs. Returns None if no site-packages directory can be
+    found, so callers can fall back.
+    """
+    # POSIX: lib/pythonX.Y/site-packages, Windows: Lib/site-packages
+    site_dirs = [d for d in prefix.glob("lib/python*/site-packages") if d.is_dir()]
+    win_site = prefix / "Lib" / "site-packages"
+    if win_site.is_dir() and win_site not in site_dirs:
+        site_dirs.append(win_site)
+    if not site_dirs:
+        return None
+
+    mapping: dict[str, str] = {}
+    for site_dir in site_dirs:
+        meta_files = list(site_dir.glob("*.dist-info/METADATA"))
+        for egg_info in site_dir.glob("*.egg-info"):
+            # setuptools writes either a directory or a single PKG-INFO-style file
+            meta_files.append(egg_info / "PKG-INFO" if egg_info.is_dir() else egg_info)
+        for meta_file in meta_files:
+            try:
+                with open(meta_file, "rb") as f:
+                    head = f.read(1024).decode("utf-8", errors="replace")
+            except OSError:
+                continue
+
+            name_m = _METADATA_NAME_RE.search(head)
+            ver_m = _METADATA_VERSION_RE.search(head)
+            if name_m and ver_m:
+                mapping[normalize_name(name_m.group(1))] = ver_m.group(1)
+
+    return mapping
+
+
+def pip_freeze(env_name: str, prefix: Path | None = None) -> dict[str, str]:
     """
     Return pip-installed packages inside the conda env as {normalized_name: version}.
 
+    Reads distribution metadata from the env's site-packages directly and only
+    falls back to `conda run ... pip freeze` if that directory cannot be located.
+    `prefix` is the env's resolved prefix; it is looked up from `env_name` if omitted.
     If pip is not available in the env, returns an empty mapping.
     """
+    if prefix is None:
+        prefix = _env_prefix(env_name)
+
+    site_pkgs = site_packages_pkgs(prefix) if prefix is not None else None
+    if site_pkgs is not None:
+        return site_pkgs
+
     try:
         out = run(["conda", "run", "-n", env_name, "python", "-m", "pip", "freeze"])
     except Exception:
@@ -144,7 +257,7 @@ def pip_freeze(env_name: str) -> dict[str, str]:
 
 def normalize_name(name: str) -> str:
     """PEP 503-style normalization (lowercase; collapse -_. to -)."""
-    return re.sub(r"[-_.]+", "-", name.strip().lower())
+    return _NORMALIZE_RE.sub("-", name.strip().lower())
 
 
 def parse_conda_dep(dep: str) -> tuple[str | None, str]:
@@ -164,15 +277,49 @@ def parse_conda_dep(dep: str) -> tuple[str | None, str]:
         channel, dep = dep.split("::", 1)
 
     # Extract the leading name token (supports dots, underscores, dashes)
-    m = re.match(r"^([A-Za-z0-9_.-]+)", dep)
+    m = _CONDA_NAME_RE.match(dep)
     if not m:
         return channel, dep
 
     return channel, m.group(1)
 
 
-def build_conda_pkg_map(env_name: str) -> dict[str, str]:
-    """Map installed conda packages (lowercased name -> version) for the env."""
+def conda_meta_pkgs(prefix: Path) -> dict[str, str] | None:
+    """
+    Read installed conda packages straight from `<prefix>/conda-meta/*.json`.
+
+    This avoids the startup cost of `conda list`. Returns None if the
+    conda-meta directory cannot be read, so callers can fall back.
+    """
+    pkgs: dict[str, str] = {}
+    try:
+        with os.scandir(prefix / "conda-meta") as it:
+            for entry in it:
+                if not entry.name.endswith(".json"):
+                    continue
+                with open(entry.path, "rb") as f:
+                    data = _json_loads(f.read())
+                if isinstance(data, dict) and "name" in data and "version" in data:
+                    pkgs[data["name"].lower()] = data["version"]
+    except (OSError, ValueError):
+        return None
+
+    return pkgs or None
+
+
+def build_conda_pkg_map(env_name: str, prefix: Path | None = None) -> dict[str, str]:
+    """
+    Map installed conda packages (lowercased name -> version) for the env.
+
+    `prefix` is the env's resolved prefix; it is looked up from `env_name` if omitted.
+    """
+    if prefix is None:
+        prefix = _env_prefix(env_name)
+
+    meta_pkgs = conda_meta_pkgs(prefix) if prefix is not None else None
+    if meta_pkgs is not None:
+        return meta_pkgs
+
     pkgs = conda_list_json(env_name)
     return {p["name"].lower(): p["version"] for p in pkgs if "name" in p and "version" in p}
 
@@ -227,16 +374,18 @@ def extract_pip_name(spec: str) -> tuple[str, str]:
 
     Examples:
       "uvicorn[standard]" -> ("uvicorn", "[standard]")
+      "uvicorn[standard]>=0.30" -> ("uvicorn", "[standard]")
       "fastapi" -> ("fastapi", "")
     """
     s = spec.strip()
 
-    m = re.match(r"^([A-Za-z0-9_.-]+)(\[.*\])?$", s)
+    m = _PIP_NAME_RE.match(s)
     if not m:
-        # fallback: take token until first non-name char
-        m2 = re.match(r"^([A-Za-z0-9_.-]+)", s)
-        base = m2.group(1) if m2 else s
-        return normalize_name(base), ""
+        # fallback: take the name token (and any extras) up to the version specifier
+        m2 = _PIP_NAME_PREFIX_RE.match(s)
+        if not m2:
+            return normalize_name(s), ""
+        return normalize_name(m2.group(1)), m2.group(2) or ""
 
     base = normalize_name(m.group(1))
     extras = m.group(2) or ""
@@ -267,10 +416,7 @@ def pin_pip_deps(pip_list: list[Any], pip_pkgs: dict[str, str]) -> list[Any]:
         base_norm, extras = extract_pip_name(s)
         ver = pip_pkgs.get(base_norm)
         if ver:
-            # Keep original base token (including extras) and pin to version
-            out.append(f"{s}{'==' if '==' not in s else ''}{ver}" if extras else f"{s}=={ver}")
-            # The above line is safe but may duplicate extras handling; simpler below:
-            # out.append(f"{base_norm}{extras}=={ver}")  # uses normalized name
+            out.append(f"{base_norm}{extras}=={ver}")
         else:
             out.append(s)
 
@@ -321,7 +467,7 @@ def main() -> int:
     ap.add_argument(
         "--pin-pip",
         action="store_true",
-        help="Also pin pip subsection using pip freeze from the env.",
+        help="Also pin pip subsection using installed package metadata from the env.",
     )
     ap.add_argument(
         "--keep-python-unpinned",
@@ -362,11 +508,21 @@ def main() -> int:
         print("environment.yml must contain a top-level 'dependencies:' list.", file=sys.stderr)
         return 2
 
-    conda_pkgs = build_conda_pkg_map(env_name)
+    # Resolve the env prefix once up front so both lookups below share it.
+    prefix = _env_prefix(env_name)
+
+    # Both lookups normally read metadata files in-process, so threads gain little
+    # there. The overlap pays off on the fallback paths (`conda list --json` /
+    # `conda run ... pip freeze`), where each lookup waits on a subprocess.
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        f_conda = ex.submit(build_conda_pkg_map, env_name, prefix)
+        f_pip = ex.submit(pip_freeze, env_name, prefix) if args.pin_pip else None
+        conda_pkgs = f_conda.result()
+        pip_pkgs = f_pip.result() if f_pip else {}
+
     pinned_deps = pin_conda_deps(deps, conda_pkgs, keep_python_unpinned=args.keep_python_unpinned)
 
     if args.pin_pip:
-        pip_pkgs = pip_freeze(env_name)
         updated: list[Any] = []
         for item in pinned_deps:
             if isinstance(item, dict) and "pip" in item and isinstance(item["pip"], list):
@@ -381,7 +537,7 @@ def main() -> int:
     out_data["dependencies"] = pinned_deps
 
     out_path = in_path if args.inplace else Path(args.output)
-    out_path.write_text(yaml.safe_dump(out_data, sort_keys=False))
+    out_path.write_text(yaml.dump(out_data, Dumper=_YamlDumper, sort_keys=False))
     print(f"Wrote pinned environment to: {out_path}")
 
     if args.lock_linux64:
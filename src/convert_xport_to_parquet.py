@@ -0,0 +1,66 @@
+import argparse
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pyreadstat
+from src.utils.constants import DATA_PATH, PARQUET_PATH
+
+CHUNK_SIZE = 50_000
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(
+        description="Stream the BRFSS XPT file into a zstd-compressed Parquet file."
+    )
+    ap.add_argument(
+        "--chunksize",
+        type=int,
+        default=CHUNK_SIZE,
+        help=f"Rows decoded per chunk (default: {CHUNK_SIZE}).",
+    )
+    args = ap.parse_args(argv)
+
+    if not DATA_PATH.exists():
+        raise FileNotFoundError(f"Missing file: {DATA_PATH.resolve()}")
+
+    # Ensure output directory exists
+    PARQUET_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+    # Write to a temp file first so a partial run never looks like a valid cache.
+    tmp_path = PARQUET_PATH.with_suffix(".parquet.tmp")
+    writer = None
+    total_rows = 0
+
+    try:
+        for df_chunk, _ in pyreadstat.read_file_in_chunks(
+            pyreadstat.read_xport,
+            str(DATA_PATH),
+            chunksize=max(1, args.chunksize),
+            encoding="latin1",
+        ):
+            table = pa.Table.from_pandas(df_chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, table.schema, compression="zstd")
+            elif not table.schema.equals(writer.schema):
+                # e.g. a text column that is entirely empty in this chunk
+                table = table.cast(writer.schema)
+
+            writer.write_table(table)
+            total_rows += table.num_rows
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    if writer is None:
+        raise ValueError(f"No rows read from: {DATA_PATH.resolve()}")
+
+    writer.close()
+
+    tmp_path.replace(PARQUET_PATH)
+    print(f"Wrote {total_rows} rows to {PARQUET_PATH.resolve()}")
+
+
+if __name__ == "__main__":
+    main()
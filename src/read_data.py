@@ -1,46 +1,120 @@
+import argparse
+import csv
+import os
+
 import pyreadstat
-import pandas as pd
-from src.utils.constants import DATA_PATH, COLUMNS_OUT_PATH
+from src.utils.constants import DATA_PATH, COLUMNS_OUT_PATH, PARQUET_PATH
+
+
+def load_data(columns: list[str] | None = None, workers: int | None = None):
+    """
+    Load the BRFSS dataset as a pandas DataFrame, optionally projecting columns.
+
+    Prefers the Parquet cache written by `src.convert_xport_to_parquet` when it is
+    at least as new as the XPT file; otherwise decodes the XPT across processes.
+    """
+    if PARQUET_PATH.exists() and (
+        not DATA_PATH.exists() or PARQUET_PATH.stat().st_mtime >= DATA_PATH.stat().st_mtime
+    ):
+        import pyarrow.parquet as pq
 
+        return pq.read_table(PARQUET_PATH, columns=columns).to_pandas()
 
-def main() -> None:
     if not DATA_PATH.exists():
         raise FileNotFoundError(f"Missing file: {DATA_PATH.resolve()}")
 
-    df, meta = pyreadstat.read_xport(
+    _, meta = pyreadstat.read_xport(
+        str(DATA_PATH),
+        encoding="latin1",
+        metadataonly=True,
+    )
+
+    # Decode row ranges in parallel; the XPT decoder is CPU-bound.
+    df, _ = pyreadstat.read_file_multiprocessing(
+        pyreadstat.read_xport,
         str(DATA_PATH),
+        num_processes=max(1, workers or os.cpu_count() or 1),
+        num_rows=_xport_row_bound(meta),
         encoding="latin1",
+        usecols=columns,
+    )
+    return df
+
+
+def _xport_row_bound(meta) -> int:
+    """
+    Upper bound on the number of rows in the XPT file.
+
+    XPT headers do not record a row count (meta.number_rows is None), but
+    read_file_multiprocessing needs one to split the file into row ranges.
+    Records are fixed-width, so file size / record width over-counts only by
+    the header size. Without storage widths, assume 1 byte per variable.
+    """
+    widths = getattr(meta, "variable_storage_width", None) or {}
+    row_width = sum(widths.values()) or len(meta.column_names) or 1
+    return DATA_PATH.stat().st_size // row_width + 1
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(
+        description="Export {column_name: label} metadata from the BRFSS XPT file."
     )
+    ap.add_argument(
+        "--full",
+        action="store_true",
+        help="Also load every row of the dataset and report its shape (slow).",
+    )
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes used to decode the XPT file with --full when no Parquet "
+        "cache exists (default: CPU count).",
+    )
+    args = ap.parse_args(argv)
+
+    if not DATA_PATH.exists():
+        raise FileNotFoundError(f"Missing file: {DATA_PATH.resolve()}")
+
+    # Only the header/label block is parsed; no rows are materialized.
+    _, meta = pyreadstat.read_xport(
+        str(DATA_PATH),
+        encoding="latin1",
+        metadataonly=True,
+    )
+
+    if args.full:
+        df = load_data(workers=args.workers)
+        print("Shape:", df.shape)
+
+    column_names = list(meta.column_names)
     print("Loaded:", DATA_PATH)
-    print("Shape:", df.shape)
-    print("Total columns:", len(df.columns))
-    print("First columns:", list(df.columns[:10]))
-    
+    print("Total columns:", len(column_names))
+    print("First columns:", column_names[:10])
+
     # Ensure output directory exists
     COLUMNS_OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
 
     # Build a safe {column_name: label} mapping.
-    # In some pyreadstat versions, meta.column_labels is a list aligned to df.columns.
+    # In some pyreadstat versions, meta.column_labels is a list aligned to meta.column_names.
     labels_map = {}
 
     if hasattr(meta, "column_labels") and meta.column_labels is not None:
         if isinstance(meta.column_labels, dict):
             labels_map = meta.column_labels
         elif isinstance(meta.column_labels, list) and len(meta.column_labels) == len(
-            df.columns
+            column_names
         ):
-            labels_map = dict(zip(df.columns, meta.column_labels))
+            labels_map = dict(zip(column_names, meta.column_labels))
 
-    cols_df = pd.DataFrame(
-        {
-            "column_name": df.columns,
-            "label": [labels_map.get(c, "") for c in df.columns],
-        }
-    )
+    with COLUMNS_OUT_PATH.open("w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(("column_name", "label"))
+        for c in column_names:
+            w.writerow((c, labels_map.get(c, "")))
 
-    cols_df.to_csv(COLUMNS_OUT_PATH, index=False)
     print(
-        f"Wrote {len(cols_df)} \
+        f"Wrote {len(column_names)} \
         columns with labels to {COLUMNS_OUT_PATH.resolve()}"
     )
 
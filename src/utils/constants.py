@@ -28,6 +28,8 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 DATA_DIR = PROJECT_ROOT / "data"
 RAW_DATA_DIR = DATA_DIR / "raw"
 META_DATA_DIR = DATA_DIR / "metadata"
+PROCESSED_DATA_DIR = DATA_DIR / "processed"
 
 DATA_PATH = RAW_DATA_DIR / "LLCP2024.XPT"
 COLUMNS_OUT_PATH = META_DATA_DIR / "columns.csv"
+PARQUET_PATH = PROCESSED_DATA_DIR / "LLCP2024.parquet"
@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+import pin_env_versions
+
+
+@pytest.fixture
+def fake_env(tmp_path, monkeypatch):
+    """A fake conda env prefix located via a stubbed `conda info --json`."""
+    prefix = tmp_path / "envs" / "health-ai"
+    (prefix / "conda-meta").mkdir(parents=True)
+    for name, version in (("python", "3.11.14"), ("pandas", "2.3.3")):
+        (prefix / "conda-meta" / f"{name}-{version}-0.json").write_text(
+            json.dumps({"name": name, "version": version})
+        )
+    site = prefix / "lib" / "python3.11" / "site-packages"
+    site.mkdir(parents=True)
+
+    calls: list[list[str]] = []
+
+    def fake_run(cmd: list[str]) -> str:
+        calls.append(cmd)
+        if cmd[:3] == ["conda", "info", "--json"]:
+            return json.dumps({"root_prefix": str(tmp_path), "envs": [str(prefix)]})
+        raise AssertionError(f"unexpected command: {cmd}")
+
+    monkeypatch.delenv("CONDA_PREFIX", raising=False)
+    monkeypatch.delenv("CONDA_DEFAULT_ENV", raising=False)
+    monkeypatch.setattr(pin_env_versions, "run", fake_run)
+    pin_env_versions._env_prefix.cache_clear()
+    yield prefix, site, calls
+    pin_env_versions._env_prefix.cache_clear()
+
+
+def test_main_resolves_env_prefix_once(fake_env, tmp_path, monkeypatch):
+    _, _, calls = fake_env
+    env_yml = tmp_path / "environment.yml"
+    env_yml.write_text("name: health-ai\ndependencies:\n- python\n- pandas\n- pip:\n  - fastapi\n")
+    out_yml = tmp_path / "environment.pinned.yml"
+
+    monkeypatch.setattr(
+        "sys.argv",
+        ["pin_env_versions.py", "-i", str(env_yml), "-o", str(out_yml), "--pin-pip"],
+    )
+    assert pin_env_versions.main() == 0
+
+    assert calls == [["conda", "info", "--json"]]
+    assert "- python=3.11.14" in out_yml.read_text()
+    assert "- pandas=2.3.3" in out_yml.read_text()
+
+
+def test_site_packages_pkgs_reads_dist_info_and_egg_info(fake_env):
+    prefix, site, _ = fake_env
+    (site / "Uvicorn-0.40.0.dist-info").mkdir()
+    (site / "Uvicorn-0.40.0.dist-info" / "METADATA").write_text(
+        "Metadata-Version: 2.1\nName: Uvicorn\nVersion: 0.40.0\n"
+    )
+    (site / "old_dir_pkg-1.0.egg-info").mkdir()
+    (site / "old_dir_pkg-1.0.egg-info" / "PKG-INFO").write_text(
+        "Metadata-Version: 1.0\nName: old_dir_pkg\nVersion: 1.0\n"
+    )
+    (site / "old_file_pkg-2.0-py3.11.egg-info").write_text(
+        "Metadata-Version: 1.0\nName: old.file-pkg\nVersion: 2.0\n"
+    )
+
+    assert pin_env_versions.site_packages_pkgs(prefix) == {
+        "uvicorn": "0.40.0",
+        "old-dir-pkg": "1.0",
+        "old-file-pkg": "2.0",
+    }
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ("fastapi", ("fastapi", "")),
+        ("uvicorn[standard]", ("uvicorn", "[standard]")),
+        ("uvicorn[standard]>=0.30", ("uvicorn", "[standard]")),
+        ("Bar_Baz>=2", ("bar-baz", "")),
+    ],
+)
+def test_extract_pip_name(spec, expected):
+    assert pin_env_versions.extract_pip_name(spec) == expected
+
+
+def test_pin_pip_deps_keeps_extras():
+    pinned = pin_env_versions.pin_pip_deps(
+        ["uvicorn[standard]", "bar[x]>=2", "fastapi==0.128.0", "unknown", {"nested": 1}],
+        {"uvicorn": "0.40.0", "bar": "3"},
+    )
+
+    assert pinned == [
+        "uvicorn[standard]==0.40.0",
+        "bar[x]==3",
+        "fastapi==0.128.0",
+        "unknown",
+        {"nested": 1},
+    ]
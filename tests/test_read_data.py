@@ -0,0 +1,92 @@
+import csv
+
+import pandas as pd
+import pyreadstat
+import pytest
+
+from src import convert_xport_to_parquet, read_data
+
+
+@pytest.fixture
+def xpt_paths(tmp_path, monkeypatch):
+    """Point read_data at a small generated XPT file under tmp_path."""
+    data_path = tmp_path / "raw" / "SAMPLE.XPT"
+    data_path.parent.mkdir()
+    df = pd.DataFrame(
+        {
+            "AGE": [float(i) for i in range(1, 101)],
+            "SEX": ["M", "F"] * 50,
+        }
+    )
+    pyreadstat.write_xport(
+        df,
+        str(data_path),
+        column_labels=["Age in years", "Sex"],
+    )
+
+    monkeypatch.setattr(read_data, "DATA_PATH", data_path)
+    monkeypatch.setattr(read_data, "COLUMNS_OUT_PATH", tmp_path / "metadata" / "columns.csv")
+    monkeypatch.setattr(read_data, "PARQUET_PATH", tmp_path / "processed" / "SAMPLE.parquet")
+    return tmp_path
+
+
+def test_main_writes_column_labels(xpt_paths):
+    read_data.main([])
+
+    with (xpt_paths / "metadata" / "columns.csv").open(newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+
+    assert rows == [
+        ["column_name", "label"],
+        ["AGE", "Age in years"],
+        ["SEX", "Sex"],
+    ]
+
+
+def test_main_full_decodes_xport_across_workers(xpt_paths, capsys):
+    read_data.main(["--full", "--workers", "2"])
+
+    assert "Shape: (100, 2)" in capsys.readouterr().out
+
+
+def test_load_data_without_parquet_cache_reads_xport(xpt_paths):
+    df = read_data.load_data(columns=["SEX"], workers=2)
+
+    assert list(df.columns) == ["SEX"]
+    assert len(df) == 100
+
+
+def test_load_data_prefers_parquet_cache(xpt_paths, monkeypatch):
+    monkeypatch.setattr(convert_xport_to_parquet, "DATA_PATH", read_data.DATA_PATH)
+    monkeypatch.setattr(convert_xport_to_parquet, "PARQUET_PATH", read_data.PARQUET_PATH)
+    convert_xport_to_parquet.main(["--chunksize", "30"])
+
+    assert read_data.PARQUET_PATH.exists()
+    assert not read_data.PARQUET_PATH.with_suffix(".parquet.tmp").exists()
+
+    def fail_xport_read(*args, **kwargs):
+        raise AssertionError("XPT should not be decoded when the Parquet cache is fresh")
+
+    monkeypatch.setattr(pyreadstat, "read_file_multiprocessing", fail_xport_read)
+    df = read_data.load_data(columns=["AGE"])
+
+    assert list(df.columns) == ["AGE"]
+    assert df["AGE"].tolist() == [float(i) for i in range(1, 101)]
+
+
+def test_convert_removes_temp_file_on_failure(xpt_paths, monkeypatch):
+    monkeypatch.setattr(convert_xport_to_parquet, "DATA_PATH", read_data.DATA_PATH)
+    monkeypatch.setattr(convert_xport_to_parquet, "PARQUET_PATH", read_data.PARQUET_PATH)
+
+    read_file_in_chunks = pyreadstat.read_file_in_chunks
+
+    def broken_chunks(*args, **kwargs):
+        yield from read_file_in_chunks(*args, **kwargs)
+        raise RuntimeError("decode failed")
+
+    monkeypatch.setattr(pyreadstat, "read_file_in_chunks", broken_chunks)
+    with pytest.raises(RuntimeError, match="decode failed"):
+        convert_xport_to_parquet.main(["--chunksize", "30"])
+
+    assert not read_data.PARQUET_PATH.exists()
+    assert not read_data.PARQUET_PATH.with_suffix(".parquet.tmp").exists()